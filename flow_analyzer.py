@@ -1,7 +1,13 @@
 #!/usr/bin/env python3
 
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from operator import itemgetter
+import csv
 import logging
+import mmap
+import os
 import sys
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -29,6 +35,88 @@ PROTOCOL_MAP = {
     '132': 'sctp'  # Stream Control Transmission Protocol
 }
 
+# Shared fallback for port/protocol keys with no lookup rule
+_EMPTY = ()
+
+# Tag counted for port/protocol keys with no lookup rule
+_UNTAGGED = 'Untagged'
+
+# Picks the raw (dst_port, protocol) key out of a split flow log line;
+# field 7 is destination port, field 8 is protocol
+_RAW_KEY = itemgetter(6, 7)
+
+# Flow logs at least this many bytes are scanned in parallel chunks
+PARALLEL_THRESHOLD = 64 * 1024 * 1024
+
+def _split_ranges(mm, start, chunks):
+    """
+    Split the mapped file from start to its end into byte ranges on line boundaries.
+
+    Args:
+        mm: Memory-mapped flow log
+        start: Offset of the first line to scan
+        chunks: Number of ranges to aim for
+
+    Returns:
+        list: (start, end) offsets covering every line exactly once
+    """
+    size = len(mm)
+    step = max((size - start) // chunks, 1)
+    ranges = []
+
+    while start < size:
+        # Snap the end of the range to just after the next newline
+        end = mm.find(b'\n', min(start + step, size) - 1)
+        end = size if end == -1 else end + 1
+        ranges.append((start, end))
+        start = end
+
+    return ranges
+
+def _scan_range(log_file, start, end):
+    """
+    Count raw (dst_port, protocol) fields for the flow log lines in a byte range.
+
+    Runs in worker processes, so it only touches the file and returns the counts.
+
+    Args:
+        log_file: Path to the flow log file
+        start: Offset of the first line in the range
+        end: Offset just past the last line in the range
+
+    Returns:
+        Counter: Line counts keyed by raw (port, protocol) bytes
+    """
+    raw_counts = Counter()
+
+    # Map the file read-only and scan the raw bytes in place, so
+    # lines are neither decoded to str nor copied through a read buffer
+    with open(log_file, 'rb') as file:
+        fd = file.fileno()
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(fd, start, end - start, os.POSIX_FADV_SEQUENTIAL)
+
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+            mm.seek(start)
+            readline = mm.readline
+            raw_key = _RAW_KEY
+            position = start
+
+            while position < end:
+                line = readline()
+                position += len(line)
+
+                # Use whitespace as delimiter, stopping once the protocol
+                # field is split off; the remaining fields are not needed
+                fields = line.split(None, 8)
+                if len(fields) < 9:
+                    logger.warning(f'Skipping malformed line: {line.strip().decode(errors="replace")}')
+                    continue
+
+                raw_counts[raw_key(fields)] += 1
+
+    return raw_counts
+
 class LogAnalyzer:
     def __init__(self, lookup_table_file: str, has_headers: bool = True):
         """
@@ -39,42 +127,49 @@ class LogAnalyzer:
             has_headers: Boolean indicating if CSV files have headers (default: True)
         """
         self.has_headers = has_headers
-        self.port_rule_dictionary = defaultdict(set)
+        self.port_rule_dictionary = {}
         self.parse_lookup_table(lookup_table_file)
 
     def parse_lookup_table(self, lookup_table_file):
         """Parse the lookup table file."""
+        # Collect rules in a local defaultdict; only the frozen plain dict
+        # snapshot is stored on the analyzer
+        rules = defaultdict(set)
+
         try:
-            with open(lookup_table_file, 'r') as f:
-                # Read all lines
-                lines = f.readlines()
+            with open(lookup_table_file, 'r', newline='') as f:
+                # Tokenize rows in C; quotes are kept literally, as with a plain split
+                reader = csv.reader(f, skipinitialspace=True, quoting=csv.QUOTE_NONE)
 
                 # Skip header if present
                 if self.has_headers:
-                    lines = lines[1:]
-
-                for line in lines:
-                    # Split by comma
-                    row = [field.strip() for field in line.strip().split(',')]
+                    next(reader, None)
 
+                # Stream rows instead of reading the whole file into memory
+                for row in reader:
                     if len(row) < 3:
-                        logger.warning(f'Skipping malformed line: {line.strip()}')
+                        logger.warning(f'Skipping malformed line: {",".join(row)}')
                         continue
 
                     try:
                         port = int(row[0])
-                        protocol = row[1].lower()
-                        tag = row[2]
+                        # Intern names so rule and count dict lookups hit the identity fast path
+                        protocol = sys.intern(row[1].strip().lower())
+                        tag = sys.intern(row[2].strip())
 
-                        key = (port, protocol)
-                        if key not in self.port_rule_dictionary:
-                            self.port_rule_dictionary[key] = set()
-                        self.port_rule_dictionary[key].add(tag)
+                        rules[(port, protocol)].add(tag)
 
                     except (ValueError, IndexError) as e:
-                        logger.warning(f'Error processing line: {line.strip()}, Error: {str(e)}')
+                        logger.warning(f'Error processing line: {",".join(row)}, Error: {str(e)}')
                         continue
 
+            # Freeze the rules into a plain dict of tag tuples, which are
+            # smaller and faster to iterate than sets
+            self.port_rule_dictionary = {
+                key: tuple(sorted(tags))
+                for key, tags in rules.items()
+            }
+
         except FileNotFoundError:
             logger.error(f'Could not find {lookup_table_file}')
             sys.exit(1)
@@ -92,41 +187,61 @@ class LogAnalyzer:
         Returns:
             tuple: (tag_counts, port_protocol_counts)
         """
-        tag_count = defaultdict(int)
-        port_protocol_count = defaultdict(int)
-
-        try:
-            with open(log_file, 'r') as file:
-                if self.has_headers:
-                    next(file)
-
-                for line in file:
-                    # Use space as delimiter
-                    fields = line.strip().split()
-                    if len(fields) < 14:
-                        logger.warning(f'Skipping malformed line: {line.strip()}')
-                        continue
-
-                    try:
-                        dst_port = int(fields[6])  # Field 7 is destination port
-                        protocol = fields[7]       # Field 8 is protocol
-
-                        # Convert protocol number to lowercase string for matching
-                        protocol = PROTOCOL_MAP.get(protocol, protocol.lower())
-                        port_protocol_count[(dst_port, protocol)] += 1
-
-                        key = (dst_port, protocol)
-                        tags = self.port_rule_dictionary.get(key, set())
+        tag_count = Counter()
+        port_protocol_count = Counter()
+        raw_counts = Counter()
 
-                        if tags:
-                            for tag in tags:
-                                tag_count[tag] += 1
-                        else:
-                            tag_count['Untagged'] += 1
+        # Bind hot lookups to local names before the loops
+        rules_get = self.port_rule_dictionary.get
+        pmap_get = PROTOCOL_MAP.get
 
-                    except ValueError as e:
-                        logger.warning(f'Unable to process line: {line.strip()}, Error: {str(e)}')
-                        continue
+        try:
+            ranges = []
+            with open(log_file, 'rb') as file:
+                size = os.fstat(file.fileno()).st_size
+                # mmap cannot map an empty file
+                if size:
+                    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        if self.has_headers:
+                            mm.readline()
+
+                        # Large logs are split into one range per CPU
+                        chunks = (os.cpu_count() or 1) if size >= PARALLEL_THRESHOLD else 1
+                        ranges = _split_ranges(mm, mm.tell(), chunks)
+
+            # Only count the raw (port, protocol) fields per line; the
+            # conversion and tag lookup run once per distinct pair below
+            if len(ranges) == 1:
+                raw_counts = _scan_range(log_file, *ranges[0])
+            elif ranges:
+                starts, ends = zip(*ranges)
+                with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+                    for counts in executor.map(_scan_range, repeat(log_file), starts, ends):
+                        raw_counts.update(counts)
+
+            for (raw_port, raw_protocol), count in raw_counts.items():
+                try:
+                    dst_port = int(raw_port)
+                except ValueError as e:
+                    logger.warning(f'Unable to process {count} line(s) with port {raw_port.decode(errors="replace")}, Error: {str(e)}')
+                    continue
+
+                # Convert protocol number to lowercase string for matching
+                raw_protocol = raw_protocol.decode(errors='replace')
+                protocol = pmap_get(raw_protocol)
+                if protocol is None:
+                    protocol = sys.intern(raw_protocol.lower())
+                port_protocol_count[(dst_port, protocol)] += count
+
+            # Tags are counted once per merged (port, protocol) key
+            for key, count in port_protocol_count.items():
+                tags = rules_get(key, _EMPTY)
+
+                if tags:
+                    for tag in tags:
+                        tag_count[tag] += count
+                else:
+                    tag_count[_UNTAGGED] += count
 
         except FileNotFoundError:
             logger.error(f'Could not find {log_file}')
@@ -140,35 +255,24 @@ class LogAnalyzer:
     def write_results(self, output_file, tag_count, port_protocol_count):
         """Write analysis results to output file."""
         try:
+            # Build the report in memory and write it in a single call
+            lines = ["Tag Counts:\n", "Tag,Count\n"]
+            lines.extend(f"{tag},{count}\n" for tag, count in sorted(tag_count.items()))
+
+            lines.append("\n")
+
+            # Port/protocol combination counts
+            lines.append("Port/Protocol Combination Counts:\n")
+            lines.append("Port,Protocol,Count\n")
+
+            # Sort by port number; protocols were already mapped to names by log_parser
+            lines.extend(
+                f"{port},{protocol},{count}\n"
+                for (port, protocol), count in sorted(port_protocol_count.items(), key=lambda item: item[0][0])
+            )
+
             with open(output_file, 'w') as f:
-                # Write tag counts
-                f.write("Tag Counts:\n")
-                f.write("Tag,Count\n")
-                for tag, count in sorted(tag_count.items()):
-                    f.write(f"{tag},{count}\n")
-
-                f.write("\n")
-
-                # Write port/protocol combination counts
-                f.write("Port/Protocol Combination Counts:\n")
-                f.write("Port,Protocol,Count\n")
-
-                # Process counts
-                sorted_counts = []
-                for (port, protocol), count in port_protocol_count.items():
-                    # Use the protocol as is, or find its name in PROTOCOL_MAP
-                    protocol_name = protocol
-                    # Check if the protocol is a numeric key in PROTOCOL_MAP
-                    for key, value in PROTOCOL_MAP.items():
-                        if value == protocol:
-                            protocol_name = value
-                            break
-
-                    sorted_counts.append((port, protocol_name, count))
-
-                # Sort by port number and write
-                for port, protocol, count in sorted(sorted_counts, key=lambda x: int(x[0])):
-                    f.write(f"{port},{protocol},{count}\n")
+                f.writelines(lines)
 
         except Exception as e:
             logger.error(f"Error writing results to {output_file}: {str(e)}")
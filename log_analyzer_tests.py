@@ -2,6 +2,7 @@ import os
 import shutil
 import unittest
 import tempfile
+from unittest import mock
 from flow_analyzer import LogAnalyzer
 
 class TestLogAnalyzer(unittest.TestCase):
@@ -59,9 +60,9 @@ class TestLogAnalyzer(unittest.TestCase):
             self.assertIn((22, 'tcp'), analyzer.port_rule_dictionary)
 
             # Verify tags
-            self.assertEqual(analyzer.port_rule_dictionary[(80, 'tcp')], {'web'})
-            self.assertEqual(analyzer.port_rule_dictionary[(443, 'tcp')], {'ssl'})
-            self.assertEqual(analyzer.port_rule_dictionary[(22, 'tcp')], {'ssh'})
+            self.assertEqual(analyzer.port_rule_dictionary[(80, 'tcp')], ('web',))
+            self.assertEqual(analyzer.port_rule_dictionary[(443, 'tcp')], ('ssl',))
+            self.assertEqual(analyzer.port_rule_dictionary[(22, 'tcp')], ('ssh',))
 
     def test_case_insensitive_protocol_matching_without_headers(self):
         """
@@ -84,9 +85,9 @@ class TestLogAnalyzer(unittest.TestCase):
             self.assertIn((22, 'tcp'), analyzer.port_rule_dictionary)
 
             # Verify tags
-            self.assertEqual(analyzer.port_rule_dictionary[(80, 'tcp')], {'web'})
-            self.assertEqual(analyzer.port_rule_dictionary[(443, 'tcp')], {'ssl'})
-            self.assertEqual(analyzer.port_rule_dictionary[(22, 'tcp')], {'ssh'})
+            self.assertEqual(analyzer.port_rule_dictionary[(80, 'tcp')], ('web',))
+            self.assertEqual(analyzer.port_rule_dictionary[(443, 'tcp')], ('ssl',))
+            self.assertEqual(analyzer.port_rule_dictionary[(22, 'tcp')], ('ssh',))
 
     def test_log_parsing_case_insensitive_tag_matching(self):
         """
@@ -181,8 +182,68 @@ class TestLogAnalyzer(unittest.TestCase):
         tag_count, port_protocol_count = analyzer.log_parser(log_file)
 
         # Verify multiple tags
+        self.assertEqual(analyzer.port_rule_dictionary[(80, 'tcp')], ('http', 'web'))
         self.assertEqual(tag_count, {'web': 1, 'http': 1})
         self.assertEqual(port_protocol_count, {(80, 'tcp'): 1})
 
+    def test_repeated_port_protocol_aggregation(self):
+        """
+        Test that repeated and equivalent port/protocol pairs are counted together.
+        """
+        # Create lookup table with a single tag
+        lookup_content = "dstport,protocol,tag\n80,tcp,web"
+        lookup_file = self.create_temp_file('lookup_table.csv', lookup_content)
+
+        # Create log file mixing protocol numbers and names for the same port
+        log_content = (
+            "version account_id interface_id srcaddr dstaddr "
+            "srcport 80 6 packets bytes start end action log_status\n"
+            "1 123 eth0 192.168.1.1 10.0.0.1 1234 80 6 10 1000 1610000000 1610000010 ACCEPT OK\n"
+            "1 123 eth0 192.168.1.1 10.0.0.1 1235 80 6 10 1000 1610000000 1610000010 ACCEPT OK\n"
+            "1 123 eth0 192.168.1.1 10.0.0.1 1236 80 TCP 10 1000 1610000000 1610000010 ACCEPT OK\n"
+            "1 123 eth0 192.168.1.1 10.0.0.1 1237 abc 6 10 1000 1610000000 1610000010 ACCEPT OK\n"
+            "1 123 eth0 192.168.1.1 10.0.0.1 1238 22 6 10 1000 1610000000 1610000010 ACCEPT OK\n"
+        )
+        log_file = self.create_temp_file('flow_log.csv', log_content)
+
+        # Create analyzer and parse logs
+        analyzer = LogAnalyzer(lookup_file)
+        tag_count, port_protocol_count = analyzer.log_parser(log_file)
+
+        # Verify aggregated counts, with the invalid port skipped
+        self.assertEqual(tag_count, {'web': 3, 'Untagged': 1})
+        self.assertEqual(port_protocol_count, {(80, 'tcp'): 3, (22, 'tcp'): 1})
+
+    def test_parallel_log_parsing(self):
+        """
+        Test that scanning the log in parallel chunks matches a sequential scan.
+        """
+        # Create lookup table with tags for a few ports
+        lookup_content = "dstport,protocol,tag\n80,tcp,web\n443,tcp,ssl\n53,udp,dns"
+        lookup_file = self.create_temp_file('lookup_table.csv', lookup_content)
+
+        # Create log file with enough lines to span several chunks
+        log_lines = [
+            "version account_id interface_id srcaddr dstaddr "
+            "srcport dstport protocol packets bytes start end action log_status\n"
+        ]
+        for i in range(200):
+            port, protocol = [(80, 6), (443, 6), (53, 17), (8080, 6)][i % 4]
+            log_lines.append(
+                f"2 123 eth0 10.0.0.1 10.0.0.2 {1024 + i} {port} {protocol} 10 1000 1610000000 1610000010 ACCEPT OK\n"
+            )
+        log_file = self.create_temp_file('flow_log.csv', ''.join(log_lines))
+
+        # Parse sequentially, then force the parallel path
+        analyzer = LogAnalyzer(lookup_file)
+        expected = analyzer.log_parser(log_file)
+        with mock.patch('flow_analyzer.PARALLEL_THRESHOLD', 0), \
+                mock.patch('flow_analyzer.os.cpu_count', return_value=4):
+            tag_count, port_protocol_count = analyzer.log_parser(log_file)
+
+        # Verify both scans produce the same counts
+        self.assertEqual((tag_count, port_protocol_count), expected)
+        self.assertEqual(tag_count, {'web': 50, 'ssl': 50, 'dns': 50, 'Untagged': 50})
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file